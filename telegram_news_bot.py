@@ -4,29 +4,166 @@ Telegram News Bot - GitHub Actions Version
 Runs once per execution, designed for scheduled workflows
 """
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from aiolimiter import AsyncLimiter
+from lxml import etree
 import time
 from datetime import datetime, timedelta
 import re
 import sqlite3
 from dataclasses import dataclass
-from typing import List
+from itertools import islice
+from typing import List, Optional, Tuple
 import asyncio
 import hashlib
+import heapq
+import io
+import logging
 import os
+import queue
+import random
+import struct
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from operator import attrgetter
+
+logger = logging.getLogger(__name__)
 
 try:
     from telegram import Bot
+    from telegram.error import RetryAfter
     TELEGRAM_AVAILABLE = True
 except ImportError:
-    print("Installing required packages...")
+    logger.warning("Installing required packages...")
     import subprocess
     subprocess.check_call(["pip", "install", "python-telegram-bot"])
     from telegram import Bot
+    from telegram.error import RetryAfter
     TELEGRAM_AVAILABLE = True
 
-@dataclass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# aiohttp only decodes brotli bodies when the Brotli package is installed
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Articles older than this no longer show up in feeds, so dedup can forget them
+SENT_HISTORY_DAYS = 7
+
+# Rows older than this are purged so the table stays small
+ARTICLE_RETENTION_DAYS = 30
+
+# Sent-hash filter persisted between runs, next to telegram_news.db
+SENT_FILTER_PATH = 'telegram_news_sent.bloom'
+
+# Extra attempts for a feed after a connection error or 5xx, with exponential backoff
+FETCH_RETRIES = 2
+FETCH_BACKOFF_SECONDS = 0.3
+
+MAX_IMPORTANCE_SCORE = 15
+
+# Points per matched keyword in each category
+_CATEGORY_WEIGHTS = (
+    ('breaking_urgent', 8),
+    ('high_impact', 6),
+    ('indian_companies', 4),
+    ('global_tech', 4),
+    ('tech_trends', 3),
+)
+
+# (minimum score, emoji, label), checked top-down
+_URGENCY_TIERS = (
+    (12, "🚨", "BREAKING"),
+    (9, "📢", "IMPORTANT"),
+    (0, "⚡", "HIGH IMPACT"),
+)
+
+_MESSAGE_TEMPLATE = """{emoji} **{urgency}**
+
+**{title}**
+
+📍 {source} | ⭐ {score}/15
+
+🔗 [Read More]({url})
+
+#TechNews #Breaking"""
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+')
+
+_INSERT_ARTICLE_SQL = 'INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)'
+
+_HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+}
+
+def _element_text(item, tag: str) -> str:
+    element = item.find(tag)
+    return ''.join(element.itertext()).strip() if element is not None else ''
+
+def _item_link(item) -> str:
+    """RSS puts the URL in <link> text, Atom in the href of the alternate link"""
+    for link in item.iterfind('{*}link'):
+        if link.text and link.text.strip():
+            return link.text.strip()
+        if link.get('href') and link.get('rel', 'alternate') == 'alternate':
+            return link.get('href').strip()
+    return ''
+
+def parse_feed_items(body: bytes, limit: int = 10) -> List[Tuple[str, str, str]]:
+    """Extract (title, url, description) from an RSS or Atom body
+    
+    Kept at module level and free of bot state so it can run in a worker thread.
+    """
+    items = []
+    
+    # Stream RSS 2.0 <item>, RSS 1.0 (namespaced) <item> or Atom <entry> elements
+    # and stop after `limit`, so the rest of the document is never parsed
+    events = etree.iterparse(
+        io.BytesIO(body), tag=('{*}item', '{*}entry'),
+        recover=True, resolve_entities=False, no_network=True
+    )
+    try:
+        for _, item in islice(events, limit):
+            try:
+                title = _element_text(item, '{*}title')
+                url = _item_link(item)
+                
+                if title and url:
+                    description = _element_text(item, '{*}description') or _element_text(item, '{*}summary')
+                    items.append((title, url, _TAG_RE.sub('', description)))
+            except:
+                pass
+            
+            # Free finished items instead of keeping the whole tree in memory
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+    except etree.XMLSyntaxError:
+        pass
+    
+    return items
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Regex word-boundary test on both sides of text[start:end]"""
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    return not (before.isalnum() or before == '_') and not (after.isalnum() or after == '_')
+
+def _hash_pair(digest: bytes) -> Tuple[int, int]:
+    """Split a 16-byte digest into two 64-bit hashes for double hashing"""
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+@dataclass(slots=True, frozen=True)
 class NewsItem:
     title: str
     url: str
@@ -35,6 +172,77 @@ class NewsItem:
     importance_score: int
     content_hash: str = ""
 
+class StableBloomFilter:
+    """Stable Bloom filter (Deng & Rafiei): bounded memory, old keys fade out
+    
+    Every insert decrements a few random cells before setting the key's cells
+    to max_value, so keys inserted long ago are gradually forgotten while the
+    false-positive rate stays near error_rate.
+    """
+    
+    # Save time (Unix seconds) written ahead of the cells; file mtimes are not
+    # trustworthy once a cache or artifact restore has touched the file
+    _HEADER = struct.Struct('<d')
+    
+    def __init__(self, num_cells: int = 1 << 20, num_hashes: int = 4, max_value: int = 3,
+                 error_rate: float = 0.01):
+        self.num_cells = num_cells
+        self.num_hashes = num_hashes
+        self.max_value = max_value
+        # Decrements per insert that hold the stable false-positive rate at error_rate
+        self.decrements = max(1, round(1 / (
+            ((1 / (1 - error_rate ** (1 / num_hashes))) ** (1 / max_value) - 1)
+            * (1 / num_hashes - 1 / num_cells)
+        )))
+        self.cells = bytearray(num_cells)
+        self.saved_at = None
+    
+    def _positions(self, key: str):
+        # Kirsch-Mitzenmacher: h1 + i*h2 gives all k indices from one digest.
+        # Keys are already hex digests, so no rehashing is needed.
+        h1, h2 = _hash_pair(bytes.fromhex(key))
+        h2 |= 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_cells
+    
+    def add(self, key: str):
+        for _ in range(self.decrements):
+            pos = random.randrange(self.num_cells)
+            if self.cells[pos]:
+                self.cells[pos] -= 1
+        for pos in self._positions(key):
+            self.cells[pos] = self.max_value
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.cells[pos] for pos in self._positions(key))
+    
+    def save(self, path: str):
+        # Write then rename so a crash never leaves a truncated filter behind
+        saved_at = time.time()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self._HEADER.pack(saved_at))
+            f.write(self.cells)
+        os.replace(tmp_path, path)
+        self.saved_at = saved_at
+    
+    @classmethod
+    def load(cls, path: str, **params):
+        """Read a filter written by save(); None if missing, headerless or sized differently"""
+        bloom = cls(**params)
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(cls._HEADER.size)
+                read = f.readinto(bloom.cells)
+                trailing = f.read(1)
+        except FileNotFoundError:
+            return None
+        
+        if len(header) != cls._HEADER.size or read != bloom.num_cells or trailing:
+            return None
+        bloom.saved_at, = cls._HEADER.unpack(header)
+        return bloom
+
 class TelegramNewsBot:
     def __init__(self):
         # Get credentials from environment variables
@@ -49,7 +257,7 @@ class TelegramNewsBot:
             self.channel_username = '@' + self.channel_username
         
         self.bot = Bot(token=self.bot_token)
-        print(f"Bot initialized for channel: {self.channel_username}")
+        logger.info("Bot initialized for channel: %s", self.channel_username)
         
         # News sources
         self.news_sources = {
@@ -78,12 +286,60 @@ class TelegramNewsBot:
             'tech_trends': ['ai', 'crypto', 'bitcoin', 'ethereum', 'blockchain', '5g', 'quantum']
         }
         
+        # Extra points when these appear in the title itself
+        self.title_bonus_keywords = {
+            'title_breaking': ['breaking', 'major', 'massive'],
+            'title_india': ['india', 'indian']
+        }
+        
+        # Flat keyword -> (points, title bonus tag or None) table, so scoring is
+        # a straight sum with no per-category iteration
+        self._keyword_weights = {}
+        for category, weight in _CATEGORY_WEIGHTS:
+            for keyword in self.high_impact_keywords[category]:
+                self._keyword_weights[keyword] = (weight, None)
+        for tag, keywords in self.title_bonus_keywords.items():
+            for keyword in keywords:
+                weight, _ = self._keyword_weights.get(keyword, (0, None))
+                self._keyword_weights[keyword] = (weight, tag)
+        
+        # One automaton over every keyword reports all hits in a single pass;
+        # without pyahocorasick, words are looked up in _keyword_weights directly
+        self._ac = self._build_automaton(self._keyword_weights) if AHOCORASICK_AVAILABLE else None
+        
+        # HTTP session is created lazily inside the running event loop
+        self._session = None
+        # The only cap on concurrent fetches; the connector is left at its default
+        # so queued feeds wait here rather than inside the request timeout
+        self._fetch_slots = asyncio.Semaphore(8)
+        
+        # source -> (url, etag, last_modified, body_hash) of feeds fetched this
+        # cycle, written in one batch once their articles have been sent
+        self._fresh_validators = {}
+        
+        # Telegram allows about 20 messages per minute into a channel. A bucket
+        # of one spaces sends 3s apart; AsyncLimiter(20, 60) would let a whole
+        # run's 10 messages out at once
+        self._send_limiter = AsyncLimiter(1, 3)
+        # The limiter sets how often sends start; this caps how many can still be
+        # in flight when Telegram answers slower than that
+        self._send_slots = asyncio.Semaphore(3)
+        
         self.setup_database()
     
     def setup_database(self):
-        self.conn = sqlite3.connect('telegram_news.db', check_same_thread=False)
+        self.conn = sqlite3.connect('telegram_news.db')
         cursor = self.conn.cursor()
         
+        # WAL + NORMAL sync: one append per commit instead of journal + db fsyncs
+        cursor.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-20000;
+        ''')
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS articles (
                 content_hash TEXT PRIMARY KEY,
@@ -95,192 +351,424 @@ class TelegramNewsBot:
                 sent_to_channel BOOLEAN DEFAULT FALSE
             )
         ''')
+        
+        # Covers the sent-hash replay in load_sent_hashes without scanning unsent
+        # rows; sent_to_channel is listed so SQLite treats the index as covering
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_articles_sent
+            ON articles(scraped_at, content_hash, sent_to_channel) WHERE sent_to_channel = 1
+        ''')
+        
+        # HTTP validators and body digest from the last fetch of each feed whose
+        # articles were all sent; see save_feed_validators
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feed_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT
+            )
+        ''')
         self.conn.commit()
+        
+        self.load_sent_hashes()
+    
+    def load_sent_hashes(self):
+        """Restore the sent-hash filter from disk, or seed it from recent history"""
+        since = datetime.now() - timedelta(days=SENT_HISTORY_DAYS)
+        
+        self.sent_bloom = StableBloomFilter.load(SENT_FILTER_PATH)
+        if self.sent_bloom is not None:
+            # Only catch up on rows sent after the filter was last saved
+            since = max(since, datetime.fromtimestamp(self.sent_bloom.saved_at))
+        else:
+            self.sent_bloom = StableBloomFilter()
+        
+        cutoff = since.isoformat()
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT content_hash FROM articles
+            WHERE sent_to_channel = 1 AND scraped_at >= ?
+            ORDER BY scraped_at
+        ''', (cutoff,))
+        for (content_hash,) in cursor:
+            self.sent_bloom.add(content_hash)
+    
+    def load_feed_validators(self) -> dict:
+        """(conditional-GET headers, body digest) for every cached feed, read in one query"""
+        validators = {}
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT url, etag, last_modified, body_hash FROM feed_cache')
+        for feed_url, etag, last_modified, body_hash in cursor:
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            validators[feed_url] = (headers, body_hash)
+        return validators
+    
+    def save_feed_validators(self, unsent_sources: set):
+        """Persist this cycle's feed validators in one transaction
+        
+        Feeds in unsent_sources still have articles waiting to go out, so their
+        validators are left stale: the next run gets a full response and
+        re-parses them instead of a 304 that would hide those articles.
+        """
+        rows = [
+            validators for source_name, validators in self._fresh_validators.items()
+            if source_name not in unsent_sources
+        ]
+        self._fresh_validators = {}
+        if not rows:
+            return
+        
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO feed_cache VALUES (?, ?, ?, ?)', rows)
     
     def create_content_hash(self, title: str, url: str) -> str:
-        clean_title = re.sub(r'[^\w\s]', '', title.lower()).strip()
-        content = f"{clean_title}:{url}"
-        return hashlib.md5(content.encode()).hexdigest()
+        clean_title = _PUNCT_RE.sub('', title.lower()).strip()
+        # Same digest as hashing f"{clean_title}:{url}", without building that string
+        digest = hashlib.blake2b(clean_title.encode(), digest_size=16)
+        digest.update(b':')
+        digest.update(url.encode())
+        return digest.hexdigest()
     
-    def is_article_sent(self, content_hash: str) -> bool:
+    def create_legacy_content_hash(self, title: str, url: str) -> str:
+        """MD5 key that rows sent before the switch to blake2b are stored under
+        
+        Checked alongside the current key so those articles are not posted
+        again; can go once ARTICLE_RETENTION_DAYS have purged the MD5 rows.
+        """
+        clean_title = _PUNCT_RE.sub('', title.lower()).strip()
+        return hashlib.md5(f"{clean_title}:{url}".encode()).hexdigest()
+    
+    def filter_sent_articles(self, articles: List[NewsItem]) -> List[NewsItem]:
+        """Drop articles already sent, confirming filter hits with a single query"""
+        keys = {
+            article.content_hash: (article.content_hash, self.create_legacy_content_hash(article.title, article.url))
+            for article in articles
+        }
+        
+        # A miss means never sent, or sent long enough ago to have faded from
+        # the filter; only probable hits are looked up in SQLite
+        maybe_sent = [key for article_keys in keys.values() for key in article_keys if key in self.sent_bloom]
+        if not maybe_sent:
+            return articles
+        
+        placeholders = ','.join('?' * len(maybe_sent))
         cursor = self.conn.cursor()
-        cursor.execute('SELECT content_hash FROM articles WHERE content_hash = ? AND sent_to_channel = 1', (content_hash,))
-        return cursor.fetchone() is not None
+        cursor.execute(f'SELECT content_hash FROM articles WHERE sent_to_channel = 1 AND content_hash IN ({placeholders})', maybe_sent)
+        sent = {content_hash for (content_hash,) in cursor}
+        return [article for article in articles if sent.isdisjoint(keys[article.content_hash])]
+    
+    @staticmethod
+    def _build_automaton(keywords):
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _keyword_hits(self, text: str):
+        """(end offset, keyword) for each whole-word keyword in text, left to right"""
+        if self._ac is not None:
+            for end, keyword in self._ac.iter(text):
+                if _is_whole_word(text, end + 1 - len(keyword), end + 1):
+                    yield end + 1, keyword
+        else:
+            # Keywords are single words, so a dict hit on a token is a whole-word match
+            for match in _WORD_RE.finditer(text):
+                if match.group() in self._keyword_weights:
+                    yield match.end(), match.group()
     
     def calculate_importance_score(self, title: str, content: str = '') -> int:
         score = 0
-        text = (title + ' ' + content).lower()
-        title_lower = title.lower()
-        
-        for category, keywords in self.high_impact_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in text)
-            if matches > 0:
-                if category == 'breaking_urgent':
-                    score += matches * 8
-                elif category == 'high_impact':
-                    score += matches * 6
-                elif category in ['indian_companies', 'global_tech']:
-                    score += matches * 4
-                else:
-                    score += matches * 3
-        
-        if any(word in title_lower for word in ['breaking', 'major', 'massive']):
+        title = title.lower()
+        text = title + ' ' + content.lower()
+        
+        # Each keyword counts once, however often it repeats in the text. Hits
+        # arrive in text order, so a keyword's first hit tells whether it is
+        # in the title and the title needs no second scan
+        title_tags = set()
+        seen = set()
+        for end, keyword in self._keyword_hits(text):
+            if keyword in seen:
+                continue
+            seen.add(keyword)
+            
+            weight, title_tag = self._keyword_weights[keyword]
+            score += weight
+            # Points only ever accumulate, so a capped score skips the rest
+            if score >= MAX_IMPORTANCE_SCORE:
+                return MAX_IMPORTANCE_SCORE
+            if title_tag is not None and end <= len(title):
+                title_tags.add(title_tag)
+        
+        if 'title_breaking' in title_tags:
             score += 8
-        if any(word in title_lower for word in ['india', 'indian']):
+        if 'title_india' in title_tags:
             score += 3
         
-        return min(score, 15)
+        return min(score, MAX_IMPORTANCE_SCORE)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            # One pooled keep-alive connector for every feed: sources sharing a
+            # host (feedburner, indiatimes) reuse the connection and DNS answer
+            connector = aiohttp.TCPConnector(ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=_HTTP_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self._session
     
-    def scrape_rss_feed(self, source_name: str, feed_url: str) -> List[NewsItem]:
+    def _score_items(self, items: List[Tuple[str, str, str]], source_name: str) -> List[NewsItem]:
         articles = []
         
-        try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(feed_url, headers=headers, timeout=15)
-            response.raise_for_status()
+        for title, url, description in items:
+            importance = self.calculate_importance_score(title, description)
             
+            if importance >= 7:
+                articles.append(NewsItem(
+                    title=title,
+                    url=url,
+                    source=source_name,
+                    published_time=datetime.now().strftime('%Y-%m-%d %H:%M'),
+                    importance_score=importance,
+                    content_hash=self.create_content_hash(title, url)
+                ))
+        
+        return articles
+    
+    async def fetch_feed(self, feed_url: str, validators: dict) -> Optional[Tuple[bytes, str, str]]:
+        """Download a feed; (body, etag, last_modified), or None if unchanged"""
+        for attempt in range(FETCH_RETRIES + 1):
             try:
-                soup = BeautifulSoup(response.content, 'xml')
-            except:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                async with self._fetch_slots:
+                    async with self._get_session().get(feed_url, headers=validators) as response:
+                        # 304: nothing new since the last run, skip parsing entirely
+                        if response.status == 304:
+                            return None
+                        response.raise_for_status()
+                        body = await response.read()
+                        return body, response.headers.get('ETag'), response.headers.get('Last-Modified')
+            except aiohttp.ClientResponseError as e:
+                if e.status < 500 or attempt == FETCH_RETRIES:
+                    raise
+            except aiohttp.ClientConnectionError:
+                if attempt == FETCH_RETRIES:
+                    raise
+            
+            # Back off outside the semaphore so other feeds can use the slot
+            await asyncio.sleep(FETCH_BACKOFF_SECONDS * 2 ** attempt)
+    
+    async def scrape_rss_feed(self, source_name: str, feed_url: str, validators: dict,
+                              last_body_hash: Optional[str] = None) -> List[NewsItem]:
+        articles = []
+        
+        try:
+            fetched = await self.fetch_feed(feed_url, validators)
+            if fetched is None:
+                return articles
+            body, etag, last_modified = fetched
             
-            items = soup.find_all('item')[:10]
+            # Servers that ignore validators still often resend an identical body.
+            # The stored digest is only written once every article from that
+            # body went out, so a match means there is nothing left to retry
+            body_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+            if body_hash == last_body_hash:
+                self._fresh_validators[source_name] = (feed_url, etag, last_modified, body_hash)
+                return articles
             
-            for item in items:
-                try:
-                    title_elem = item.find('title')
-                    link_elem = item.find('link')
-                    desc_elem = item.find('description')
-                    
-                    if title_elem and link_elem:
-                        title = title_elem.get_text().strip()
-                        url = link_elem.get_text().strip()
-                        description = desc_elem.get_text().strip() if desc_elem else ''
-                        description = re.sub(r'<[^>]+>', '', description)
-                        
-                        importance = self.calculate_importance_score(title, description)
-                        
-                        if importance >= 7:
-                            content_hash = self.create_content_hash(title, url)
-                            
-                            if not self.is_article_sent(content_hash):
-                                articles.append(NewsItem(
-                                    title=title,
-                                    url=url,
-                                    source=source_name,
-                                    published_time=datetime.now().strftime('%Y-%m-%d %H:%M'),
-                                    importance_score=importance,
-                                    content_hash=content_hash
-                                ))
-                except:
-                    continue
+            # Parse in a worker thread (lxml releases the GIL) so the event loop
+            # keeps serving other fetches
+            items = await asyncio.to_thread(parse_feed_items, body)
+            articles = self._score_items(items, source_name)
+            self._fresh_validators[source_name] = (feed_url, etag, last_modified, body_hash)
             
             if articles:
-                print(f"  Found {len(articles)} new articles from {source_name}")
+                logger.info("  Found %d high-impact articles from %s", len(articles), source_name)
             
         except Exception as e:
-            print(f"  Error with {source_name}: {str(e)[:50]}")
+            logger.warning("  Error with %s: %s", source_name, str(e)[:50] or type(e).__name__)
         
         return articles
     
-    def save_article(self, article: NewsItem, sent: bool = False):
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            article.content_hash,
-            article.url,
-            article.title,
-            article.source,
-            article.importance_score,
-            datetime.now().isoformat(),
-            sent
-        ))
-        self.conn.commit()
+    async def scrape_all_sources(self) -> List[NewsItem]:
+        """Fetch every feed concurrently and return the new high-impact articles"""
+        validators = self.load_feed_validators()
+        results = await asyncio.gather(*[
+            self.scrape_rss_feed(source_name, feed_url, *validators.get(feed_url, ({}, None)))
+            for source_name, feed_url in self.news_sources.items()
+        ])
+        
+        all_articles = []
+        for articles in results:
+            all_articles.extend(articles)
+        
+        # Dedup the whole cycle at once rather than one lookup per article
+        all_articles = self.filter_sent_articles(all_articles)
+        
+        return all_articles
+    
+    def save_articles_bulk(self, articles: List[NewsItem], sent_hashes: set):
+        """Write all articles with their final sent flag in one transaction (a single commit/fsync)"""
+        if not articles:
+            return
+        
+        scraped_at = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(_INSERT_ARTICLE_SQL, (
+                (
+                    article.content_hash,
+                    article.url,
+                    article.title,
+                    article.source,
+                    article.importance_score,
+                    scraped_at,
+                    article.content_hash in sent_hashes
+                )
+                for article in articles
+            ))
     
     async def send_to_channel(self, article: NewsItem):
         try:
-            if article.importance_score >= 12:
-                emoji = "🚨"
-                urgency = "BREAKING"
-            elif article.importance_score >= 9:
-                emoji = "📢"
-                urgency = "IMPORTANT"
-            else:
-                emoji = "⚡"
-                urgency = "HIGH IMPACT"
-            
-            message = f"""{emoji} **{urgency}**
-
-**{article.title}**
-
-📍 {article.source} | ⭐ {article.importance_score}/15
-
-🔗 [Read More]({article.url})
-
-#TechNews #Breaking"""
+            emoji, urgency = next(
+                (emoji, urgency) for threshold, emoji, urgency in _URGENCY_TIERS
+                if article.importance_score >= threshold
+            )
             
-            await self.bot.send_message(
-                chat_id=self.channel_username,
-                text=message,
-                parse_mode='Markdown',
-                disable_web_page_preview=False
+            message = _MESSAGE_TEMPLATE.format(
+                emoji=emoji,
+                urgency=urgency,
+                title=article.title,
+                source=article.source,
+                score=article.importance_score,
+                url=article.url
             )
             
-            print(f"  Sent: {article.title[:60]}...")
+            for attempt in range(2):
+                try:
+                    await self.bot.send_message(
+                        chat_id=self.channel_username,
+                        text=message,
+                        parse_mode='Markdown',
+                        disable_web_page_preview=False
+                    )
+                    break
+                except RetryAfter as e:
+                    # Flood control: wait as long as Telegram asks, then try once more
+                    if attempt:
+                        raise
+                    logger.warning("  Flood control, retrying in %ss", e.retry_after)
+                    await asyncio.sleep(e.retry_after)
+            
+            logger.info("  Sent: %s...", article.title[:60])
             return True
             
         except Exception as e:
-            print(f"  Send error: {e}")
+            logger.error("  Send error: %s", e)
             return False
     
+    async def _send_rate_limited(self, article: NewsItem) -> bool:
+        async with self._send_slots, self._send_limiter:
+            return await self.send_to_channel(article)
+    
     async def run_once(self):
         """Run one complete cycle - for GitHub Actions"""
-        print(f"\nStarting news check at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*60)
-        
-        all_articles = []
-        
-        print("\nScanning news sources...")
-        for source_name, feed_url in self.news_sources.items():
-            articles = self.scrape_rss_feed(source_name, feed_url)
-            if articles:
-                all_articles.extend(articles)
-                for article in articles:
-                    self.save_article(article)
-            await asyncio.sleep(0.5)
+        logger.info("Starting news check")
+        logger.info("=" * 60)
         
-        all_articles.sort(key=lambda x: x.importance_score, reverse=True)
+        logger.info("Scanning news sources...")
+        all_articles = await self.scrape_all_sources()
         
-        # Limit to top 10 to avoid spam
-        top_articles = all_articles[:10]
+        # Limit to top 10 to avoid spam; a bounded heap avoids sorting everything
+        top_articles = heapq.nlargest(10, all_articles, key=attrgetter('importance_score'))
+        sent_articles = []
         
         if top_articles:
-            print(f"\nFound {len(top_articles)} high-impact articles to send")
-            print("\nSending to channel...")
+            logger.info("Found %d high-impact articles to send", len(top_articles))
+            logger.info("Sending to channel...")
             
-            sent_count = 0
-            for article in top_articles:
-                success = await self.send_to_channel(article)
-                if success:
-                    sent_count += 1
-                    self.save_article(article, sent=True)
-                await asyncio.sleep(2)
+            results = await asyncio.gather(*[self._send_rate_limited(article) for article in top_articles])
+            sent_articles = [article for article, success in zip(top_articles, results) if success]
             
-            print(f"\nSummary: Sent {sent_count}/{len(top_articles)} articles")
+            logger.info("Summary: Sent %d/%d articles", len(sent_articles), len(top_articles))
         else:
-            print("\nNo new high-impact articles found")
+            logger.info("No new high-impact articles found")
+        
+        # Each article is written once, after sending, with its final flag.
+        # Unsent ones stay unflagged and their feed's validators are not
+        # saved, so the next run re-parses that feed and picks them up again
+        sent_hashes = {article.content_hash for article in sent_articles}
+        self.save_articles_bulk(all_articles, sent_hashes)
+        self.save_feed_validators({
+            article.source for article in all_articles
+            if article.content_hash not in sent_hashes
+        })
+        
+        # Saved after the rows, so a crash in between is repaired from the db on load
+        for content_hash in sent_hashes:
+            self.sent_bloom.add(content_hash)
+        if sent_hashes:
+            self.sent_bloom.save(SENT_FILTER_PATH)
+        
+        logger.info("=" * 60)
+        logger.info("Run completed successfully")
+    
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        
+        self.maintain_database()
+        self.conn.close()
+    
+    def maintain_database(self):
+        """Purge old rows, refresh planner stats and fold the WAL back into the db"""
+        cutoff = (datetime.now() - timedelta(days=ARTICLE_RETENTION_DAYS)).isoformat()
+        with self.conn:
+            self.conn.execute('DELETE FROM articles WHERE scraped_at < ?', (cutoff,))
         
-        print("="*60)
-        print("Run completed successfully\n")
+        self.conn.execute('PRAGMA optimize')
+        self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+def setup_logging() -> QueueListener:
+    """Log through a queue so formatting and stdout writes happen off the event loop"""
+    log_queue = queue.SimpleQueue()
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    listener = QueueListener(log_queue, handler)
+    
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    # An empty or unknown LOG_LEVEL (e.g. an unset CI variable) falls back to INFO
+    level = logging.getLevelName((os.getenv('LOG_LEVEL') or 'INFO').upper())
+    root.setLevel(level if isinstance(level, int) else logging.INFO)
+    
+    # httpx logs every request URL at INFO, and Telegram API URLs embed the bot token
+    for name in ('httpx', 'httpcore'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    listener.start()
+    return listener
 
 async def main():
+    listener = setup_logging()
+    bot = None
     try:
         bot = TelegramNewsBot()
         await bot.run_once()
     except Exception as e:
-        print(f"Error: {e}")
+        logger.error("Error: %s", e)
         exit(1)
+    finally:
+        if bot is not None:
+            await bot.close()
+        listener.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aiolimiter import AsyncLimiter
+
+import telegram_news_bot
+
+
+def feed(prefix, count):
+    items = ''.join(
+        f'<item><title>Breaking {prefix} Google funding {i}</title>'
+        f'<link>https://example.com/{prefix}{i}</link></item>'
+        for i in range(count)
+    )
+    return f'<rss><channel>{items}</channel></rss>'.encode()
+
+
+class UnsentArticlesRetryTest(unittest.IsolatedAsyncioTestCase):
+    """Articles that were scored but not sent must come back on a later run"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        self.addCleanup(self.tmp.cleanup)
+
+        async def handler(request):
+            name = request.match_info['name']
+            body = feed(name, 8)
+            if name == 'etag':
+                if request.headers.get('If-None-Match') == '"v1"':
+                    return web.Response(status=304)
+                return web.Response(body=body, headers={'ETag': '"v1"'})
+            # Ignores validators and resends the same body every time
+            return web.Response(body=body)
+
+        app = web.Application()
+        app.router.add_get('/{name}', handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.sources = {name: str(self.server.make_url(f'/{name}')) for name in ('etag', 'plain')}
+        self.sent = []
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def run_bot(self, telegram_up):
+        env = {'TELEGRAM_BOT_TOKEN': '123:abc', 'TELEGRAM_CHANNEL_USERNAME': 'channel'}
+        with mock.patch.dict(os.environ, env):
+            bot = telegram_news_bot.TelegramNewsBot()
+        bot.news_sources = self.sources
+        bot._send_limiter = AsyncLimiter(1000, 1)
+
+        async def send_to_channel(article):
+            if telegram_up:
+                self.sent.append(article.url)
+            return telegram_up
+
+        bot.send_to_channel = send_to_channel
+        try:
+            await bot.run_once()
+        finally:
+            await bot.close()
+
+    async def test_failed_and_overflow_articles_are_retried(self):
+        # 16 candidates: the first run cannot send, later runs send 10 at most
+        await self.run_bot(telegram_up=False)
+        self.assertEqual(self.sent, [])
+
+        for _ in range(3):
+            await self.run_bot(telegram_up=True)
+
+        self.assertEqual(len(self.sent), 16)
+        self.assertEqual(len(set(self.sent)), 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from telegram_news_bot import parse_feed_items
+
+RSS2 = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title><link>https://example.com</link>
+<item><title>First &amp; best</title><link>https://example.com/1</link>
+<description>&lt;p&gt;Hello &lt;b&gt;world&lt;/b&gt;&lt;/p&gt;</description></item>
+<item><title>No link</title><description>dropped</description></item>
+<item><title>Second</title><link> https://example.com/2 </link></item>
+</channel></rss>"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/">
+<channel><title>Feed</title><link>https://example.com</link></channel>
+<item><title>RDF item</title><link>https://example.com/rdf</link><description>Body</description></item>
+</rdf:RDF>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Feed</title>
+<link rel="self" href="https://example.com/feed"/>
+<entry><title>Atom entry</title>
+<link rel="self" href="https://example.com/self"/>
+<link rel="alternate" href="https://example.com/atom"/>
+<summary>Summary text</summary></entry>
+</feed>"""
+
+
+def rss_with_items(count):
+    items = b''.join(
+        b'<item><title>Item %d</title><link>https://example.com/%d</link></item>' % (i, i)
+        for i in range(count)
+    )
+    return b'<rss><channel>' + items + b'</channel></rss>'
+
+
+class ParseFeedItemsTest(unittest.TestCase):
+    def test_rss2(self):
+        self.assertEqual(parse_feed_items(RSS2), [
+            ('First & best', 'https://example.com/1', 'Hello world'),
+            ('Second', 'https://example.com/2', ''),
+        ])
+
+    def test_rdf(self):
+        self.assertEqual(parse_feed_items(RDF), [('RDF item', 'https://example.com/rdf', 'Body')])
+
+    def test_atom(self):
+        self.assertEqual(parse_feed_items(ATOM), [('Atom entry', 'https://example.com/atom', 'Summary text')])
+
+    def test_stops_at_limit(self):
+        items = parse_feed_items(rss_with_items(30))
+        self.assertEqual(len(items), 10)
+        self.assertEqual(items[-1][1], 'https://example.com/9')
+        self.assertEqual(len(parse_feed_items(rss_with_items(30), limit=3)), 3)
+
+    def test_truncated_document_keeps_complete_items(self):
+        body = rss_with_items(5)
+        items = parse_feed_items(body[:body.index(b'Item 3')])
+        self.assertEqual([url for _, url, _ in items], ['https://example.com/%d' % i for i in range(3)])
+
+    def test_non_xml(self):
+        self.assertEqual(parse_feed_items(b''), [])
+        self.assertEqual(parse_feed_items(b'not xml at all'), [])
+        self.assertEqual(parse_feed_items(b'<html><body><p>Oops'), [])
+
+    def test_external_entities_are_not_resolved(self):
+        body = b"""<?xml version="1.0"?>
+<!DOCTYPE rss [<!ENTITY xxe SYSTEM "file:///etc/passwd">]>
+<rss><channel><item><title>T &xxe;</title><link>https://example.com/x</link></item></channel></rss>"""
+        for title, _, _ in parse_feed_items(body):
+            self.assertNotIn('root:', title)
+
+
+if __name__ == '__main__':
+    unittest.main()
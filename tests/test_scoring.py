@@ -0,0 +1,101 @@
+import os
+import random
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+import telegram_news_bot
+
+# Straightforward whole-word scorer the fast paths must agree with
+REFERENCE_WEIGHTS = {
+    'breaking_urgent': 8,
+    'high_impact': 6,
+    'indian_companies': 4,
+    'global_tech': 4,
+    'tech_trends': 3,
+}
+
+
+def reference_score(bot, title, content=''):
+    def has(keyword, text):
+        return re.search(r'\b' + re.escape(keyword) + r'\b', text) is not None
+
+    text = (title + ' ' + content).lower()
+    title = title.lower()
+    score = sum(
+        REFERENCE_WEIGHTS[category] * sum(1 for keyword in keywords if has(keyword, text))
+        for category, keywords in bot.high_impact_keywords.items()
+    )
+    if any(has(word, title) for word in bot.title_bonus_keywords['title_breaking']):
+        score += 8
+    if any(has(word, title) for word in bot.title_bonus_keywords['title_india']):
+        score += 3
+    return min(score, telegram_news_bot.MAX_IMPORTANCE_SCORE)
+
+
+class ScoringTestMixin:
+    use_automaton = True
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        env = {'TELEGRAM_BOT_TOKEN': '123:abc', 'TELEGRAM_CHANNEL_USERNAME': 'channel'}
+        with mock.patch.dict(os.environ, env), \
+                mock.patch.object(telegram_news_bot, 'AHOCORASICK_AVAILABLE', self.use_automaton):
+            self.bot = telegram_news_bot.TelegramNewsBot()
+        self.assertEqual(self.bot._ac is not None, self.use_automaton)
+
+    def tearDown(self):
+        self.bot.conn.close()
+        self.tmp.cleanup()
+
+    def score(self, title, content=''):
+        return self.bot.calculate_importance_score(title, content)
+
+    def test_keywords_inside_other_words_do_not_count(self):
+        self.assertEqual(self.score('Officials said the aid arrived'), 0)
+        self.assertEqual(self.score('New metadata format', 'raid on olam'), 0)
+        self.assertEqual(self.score('Breakings', 'ai_lab'), 0)
+
+    def test_keywords_next_to_punctuation_count(self):
+        self.assertEqual(self.score("Byju's expands"), 4)
+        self.assertEqual(self.score('(AI) tools', '5G.'), 6)
+
+    def test_each_keyword_counts_once(self):
+        self.assertEqual(self.score('Google and google', 'GOOGLE'), 4)
+        self.assertEqual(self.score('Google and Apple'), 8)
+
+    def test_title_bonus_needs_the_keyword_in_the_title(self):
+        self.assertEqual(self.score('Paytm results', 'india'), 4)
+        self.assertEqual(self.score('Paytm in India'), 7)
+        self.assertEqual(self.score('Google update', 'a massive outage'), 12)
+        self.assertEqual(self.score('Massive update'), 15)
+
+    def test_score_is_capped(self):
+        self.assertEqual(self.score('Breaking: Google IPO surge', 'historic merger'), 15)
+
+    def test_matches_reference_scorer(self):
+        words = [
+            keyword for keywords in self.bot.high_impact_keywords.values() for keyword in keywords
+        ] + ['india', 'indian', 'said', 'aid', 'metadata', "Byju's", 'Apple!', 'OLA', 'news', '5G.', '(ai)', 'hack-a-thon']
+        rng = random.Random(1)
+        for _ in range(2000):
+            title = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+            content = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 4)))
+            self.assertEqual(self.score(title, content), reference_score(self.bot, title, content), (title, content))
+
+
+@unittest.skipUnless(telegram_news_bot.AHOCORASICK_AVAILABLE, 'pyahocorasick not installed')
+class AutomatonScoringTest(ScoringTestMixin, unittest.TestCase):
+    use_automaton = True
+
+
+class TokenScoringTest(ScoringTestMixin, unittest.TestCase):
+    use_automaton = False
+
+
+if __name__ == '__main__':
+    unittest.main()
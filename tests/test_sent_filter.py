@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from telegram_news_bot import StableBloomFilter
+
+KEYS = ['%032x' % i for i in range(1, 200)]
+
+
+class StableBloomFilterFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'sent.bloom')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_keeps_cells_and_save_time(self):
+        bloom = StableBloomFilter(num_cells=1 << 12)
+        for key in KEYS:
+            bloom.add(key)
+        bloom.save(self.path)
+
+        loaded = StableBloomFilter.load(self.path, num_cells=1 << 12)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.cells, bloom.cells)
+        self.assertEqual(loaded.saved_at, bloom.saved_at)
+        self.assertIn(KEYS[-1], loaded)
+
+    def test_save_time_does_not_depend_on_mtime(self):
+        bloom = StableBloomFilter(num_cells=1 << 12)
+        bloom.save(self.path)
+        os.utime(self.path, (0, 0))
+
+        loaded = StableBloomFilter.load(self.path, num_cells=1 << 12)
+        self.assertEqual(loaded.saved_at, bloom.saved_at)
+
+    def test_missing_file(self):
+        self.assertIsNone(StableBloomFilter.load(self.path))
+
+    def test_rejects_file_without_header(self):
+        # Cells only, as written before the save time was stored in the file
+        with open(self.path, 'wb') as f:
+            f.write(bytes(1 << 12))
+        self.assertIsNone(StableBloomFilter.load(self.path, num_cells=1 << 12))
+
+    def test_rejects_wrong_size(self):
+        StableBloomFilter(num_cells=1 << 12).save(self.path)
+        self.assertIsNone(StableBloomFilter.load(self.path, num_cells=1 << 13))
+        self.assertIsNone(StableBloomFilter.load(self.path, num_cells=1 << 11))
+
+    def test_rejects_truncated_header(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\x00' * 4)
+        self.assertIsNone(StableBloomFilter.load(self.path, num_cells=1 << 12))
+
+
+if __name__ == '__main__':
+    unittest.main()